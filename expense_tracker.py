@@ -1,56 +1,322 @@
 """
 expense_tracker.py
-Single-file CLI app: Personal Expense Tracker (JSON persistence)
+Single-file CLI app: Personal Expense Tracker (JSON Lines persistence)
 
 What it does:
 - Add expenses with amount, category, note, date
 - List expenses (filter by category and/or date range)
 - Summarize totals (overall + by category)
 - Delete an expense by its ID
-- Saves data to expenses.json (standard library only)
+- Saves data to expenses.json (standard library only; uses orjson if installed)
 """
 
 from __future__ import annotations
 
+import argparse
 import json
+import math
+import mmap
 import os
-from datetime import datetime, date
-from typing import Any, Dict, List, Optional
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from operator import itemgetter
+from typing import Any, DefaultDict, Dict, Iterable, Iterator, List, Optional, Set
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, fall back to the standard library
+    orjson = None
 
 DATA_FILE = "expenses.json"
-DATE_FMT = "%Y-%m-%d"
+# What strptime("%Y-%m-%d") accepted (including its " 8" form of %d), but ASCII
+# digits only: strptime's \d also let through other scripts' digits.
+DATE_RE = re.compile(r"([0-9]{4})-([0-9]{1,2})-([0-9]{1,2}| [1-9])\Z")
+MMAP_THRESHOLD = 1 << 20  # bytes; smaller files are cheaper to read() outright
+LEGACY_ARRAY_RE = re.compile(rb"\s*\[")  # pre-JSON Lines files hold a single array
+
+
+@dataclass
+class ExpenseStore:
+    """The loaded expenses plus the lookup state that is kept in step with them."""
+
+    expenses: List[Dict[str, Any]] = field(default_factory=list)
+    # Highest ID handed out so far. Recomputed from the file on every load, so
+    # deleted IDs are only guaranteed not to be reused within one session.
+    max_id: int = 0
+    # Expenses bucketed by category.
+    by_category: Dict[Any, List[Dict[str, Any]]] = field(default_factory=dict)
+    # Expense ID -> position in expenses, so deletes don't have to scan. Only the
+    # first record of a repeated ID (hand-edited/legacy files) is indexed; the
+    # repeated IDs are remembered so later copies can still be found by a scan.
+    id_to_index: Dict[int, int] = field(default_factory=dict)
+    duplicate_ids: Set[int] = field(default_factory=set)
+    # Dated expenses sorted by date, with their dates in a parallel list for bisect.
+    by_date: List[Dict[str, Any]] = field(default_factory=list)
+    dates: List[date] = field(default_factory=list)
+
+
+def _loads(raw: Any) -> Any:
+    """Decode JSON bytes (or a memoryview), preferring orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity, which orjson rejects but stdlib json accepts
+    return json.loads(bytes(raw) if isinstance(raw, memoryview) else raw)
+
+
+def _all_finite(item: Dict[str, Any]) -> bool:
+    """Return False if the expense holds a NaN/infinite float (orjson writes null)."""
+    return not any(isinstance(v, float) and not math.isfinite(v) for v in item.values())
+
+
+def _stored_fields(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop derived keys: those starting with "_" (e.g. "_date") are never stored."""
+    return {k: v for k, v in item.items() if not k.startswith("_")}
+
+
+def _dumps_line(item: Dict[str, Any]) -> bytes:
+    """Encode one expense as a compact, newline-terminated JSON line."""
+    item = _stored_fields(item)
+    if orjson is not None and _all_finite(item):
+        return orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+    # orjson would silently write NaN/Infinity as null; stdlib json keeps them.
+    line = json.dumps(item, separators=(",", ":"), ensure_ascii=False)
+    return line.encode("utf-8") + b"\n"
+
+
+def _decode_lines(lines: Iterable[bytes], dropped: List[bytes]) -> Iterator[Any]:
+    """Decode JSON lines; an unparseable unterminated last line goes to dropped."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield _loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # stdlib json raises UnicodeDecodeError for a cut multi-byte character;
+            # orjson reports the same thing as JSONDecodeError.
+            if line.endswith(b"\n"):
+                raise
+            # Unterminated last line: the tail of an interrupted append.
+            dropped.append(line)
+
+
+def _iter_records(raw: Any, dropped: List[bytes]) -> Iterator[Dict[str, Any]]:
+    """Yield expenses one at a time from JSON Lines (or a legacy JSON array).
+
+    A torn last line is skipped and its bytes appended to dropped. Raise
+    ValueError if the data isn't a sequence of JSON objects.
+    """
+    if LEGACY_ARRAY_RE.match(raw):
+        if isinstance(raw, mmap.mmap):
+            with memoryview(raw) as view:
+                records = _loads(view)
+        else:
+            records = _loads(raw)
+        if not isinstance(records, list):
+            raise ValueError("expected a JSON array of expenses")
+    else:
+        # Line by line, so records are indexed as they are decoded instead of
+        # after the whole file has been turned into one big list.
+        if isinstance(raw, mmap.mmap):
+            lines: Iterable[bytes] = iter(raw.readline, b"")
+        else:
+            lines = raw.splitlines(True)
+        records = _decode_lines(lines, dropped)
+
+    for record in records:
+        if not isinstance(record, dict):
+            raise ValueError("expected every expense to be a JSON object")
+        yield record
+
+
+def _index_expense(store: ExpenseStore, item: Dict[str, Any]) -> None:
+    """Append an expense to the store and register it in the lookup structures."""
+    position = len(store.expenses)
+    store.expenses.append(item)
+    store.by_category.setdefault(item.get("category"), []).append(item)
+    eid = item.get("id")
+    if isinstance(eid, int):
+        if eid in store.id_to_index:
+            store.duplicate_ids.add(eid)
+        else:
+            store.id_to_index[eid] = position  # first match wins, as the old scan did
+        if eid > store.max_id:
+            store.max_id = eid
+
+
+def _load_into(raw: Any, store: ExpenseStore, dropped: List[bytes]) -> bool:
+    """Decode raw file contents into the store in one pass.
+
+    Return True if the file needs rewriting: it is a legacy array, or its last
+    line is unterminated (torn, or a later append would be glued onto it).
+    """
+    for e in _iter_records(raw, dropped):
+        # Parse once here so filtering/sorting never has to call strptime again.
+        e["_date"] = parse_date(str(e.get("date", "")))
+        category = e.get("category")
+        if isinstance(category, str):
+            # Few distinct categories: share one lowercase string object per name,
+            # matching how add_expense and the list filter normalise their input.
+            e["category"] = sys.intern(category.lower())
+        _index_expense(store, e)
+
+    # One sort at the end beats an insort per record.
+    dated = [e for e in store.expenses if e["_date"] is not None]
+    dated.sort(key=itemgetter("_date"))
+    store.by_date.extend(dated)
+    store.dates.extend(e["_date"] for e in dated)
+    is_legacy = LEGACY_ARRAY_RE.match(raw) is not None
+    return is_legacy or raw[-1:] not in (b"", b"\n")
+
+
+def _insort_by_date(store: ExpenseStore, item: Dict[str, Any]) -> None:
+    """Insert a dated expense into the store's date-sorted index."""
+    i = bisect_right(store.dates, item["_date"])
+    store.dates.insert(i, item["_date"])
+    store.by_date.insert(i, item)
+
+
+def _remove_by_date(store: ExpenseStore, item: Dict[str, Any]) -> None:
+    """Remove an expense from the date-sorted index (no-op if it has no date)."""
+    if item["_date"] is None:
+        return
+    i = bisect_left(store.dates, item["_date"])
+    while store.by_date[i] is not item:
+        i += 1
+    del store.dates[i]
+    del store.by_date[i]
 
 
-def load_expenses(filepath: str) -> List[Dict[str, Any]]:
-    """Load expenses from a JSON file. If missing/invalid, return an empty list."""
+def _date_range(
+    store: ExpenseStore, start: Optional[date], end: Optional[date]
+) -> List[Dict[str, Any]]:
+    """Return the dated expenses within [start, end] via two binary searches."""
+    lo = bisect_left(store.dates, start) if start is not None else 0
+    hi = bisect_right(store.dates, end) if end is not None else len(store.dates)
+    return store.by_date[lo:hi]
+
+
+def _warn(message: str) -> None:
+    """Print a warning to stderr, keeping stdout for program output."""
+    print(f"Warning: {message}", file=sys.stderr)
+
+
+def _unused_path(path: str) -> str:
+    """Return path, or path.1, path.2, ... whichever does not exist yet."""
+    candidate, n = path, 0
+    while os.path.exists(candidate):
+        n += 1
+        candidate = f"{path}.{n}"
+    return candidate
+
+
+def load_expenses(filepath: str, repair: bool = True) -> ExpenseStore:
+    """Load expenses (JSON Lines). If missing/invalid, return an empty store.
+
+    With repair=False the file is only read: never converted, rewritten, or
+    moved aside when it can't be decoded.
+    """
     if not os.path.exists(filepath):
-        return []
+        return ExpenseStore()
 
+    store = ExpenseStore()
+    dropped: List[bytes] = []
     try:
-        with open(filepath, "r", encoding="utf-8") as file:
-            data = json.load(file)
-        if not isinstance(data, list):
-            return []
-        return data
-    except (json.JSONDecodeError, OSError):
-        
-        return []
-
-
-def save_expenses(filepath: str, expenses: List[Dict[str, Any]]) -> None:
-    """Save expenses to a JSON file safely (pretty-printed)."""
+        with open(filepath, "rb") as file:
+            if os.path.getsize(filepath) > MMAP_THRESHOLD:
+                # Parse straight out of the page cache: JSON Lines are read one
+                # line at a time, so the file is never copied whole into memory.
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    needs_rewrite = _load_into(mm, store, dropped)
+                finally:
+                    mm.close()
+            else:
+                needs_rewrite = _load_into(file.read(), store, dropped)
+    except ValueError:
+        # ValueError covers json/orjson.JSONDecodeError, bad UTF-8 and bad shapes.
+        # Move the file aside: starting empty on top of it would let the next
+        # delete overwrite whatever is still recoverable.
+        if repair:
+            backup = _unused_path(filepath + ".corrupt")
+            try:
+                os.replace(filepath, backup)
+                _warn(f"{filepath} is unreadable; moved it to {backup}.")
+                return ExpenseStore()
+            except OSError:
+                pass
+        _warn(f"{filepath} is unreadable; no expenses loaded.")
+        return ExpenseStore()
+    except OSError:
+        return ExpenseStore()
+
+    if dropped:
+        if not repair:
+            _warn(f"{filepath} ends with an incomplete record; ignoring it.")
+        else:
+            # Keep the torn bytes before the rewrite below removes them.
+            backup = _unused_path(filepath + ".corrupt")
+            try:
+                with open(backup, "wb") as file:
+                    file.write(dropped[0])
+                _warn(f"{filepath} had an incomplete last record; saved to {backup}.")
+            except OSError:
+                _warn(f"{filepath} ends with an incomplete record; left unchanged.")
+                needs_rewrite = False
+
+    if needs_rewrite and repair:
+        # Legacy arrays and unterminated last lines can't take appended lines.
+        rewrite_expenses(filepath, store.expenses)
+    return store
+
+
+def rewrite_expenses(filepath: str, expenses: List[Dict[str, Any]]) -> None:
+    """Rewrite the whole JSON Lines file atomically (used when records are removed)."""
+    payload = b"".join(_dumps_line(e) for e in expenses)
+    tmp_path = filepath + ".tmp"
+
     try:
-        with open(filepath, "w", encoding="utf-8") as file:
-            json.dump(expenses, file, indent=2)
+        with open(tmp_path, "wb") as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+        # A crash mid-write leaves the old file intact instead of a truncated one.
+        os.replace(tmp_path, filepath)
     except OSError:
         print("Error: Could not save data. Check file permissions or disk space.")
 
 
+def append_expense(filepath: str, item: Dict[str, Any]) -> None:
+    """Append a single expense to the JSON Lines file without rewriting it."""
+    try:
+        with open(filepath, "ab") as file:
+            file.write(_dumps_line(item))
+    except OSError:
+        print("Error: Could not save data. Check file permissions or disk space.")
+
+
+def _discard(items: List[Dict[str, Any]], target: Dict[str, Any]) -> None:
+    """Remove target from items by identity (not equality, which is slower)."""
+    for i, item in enumerate(items):
+        if item is target:
+            del items[i]
+            return
+
+
 def parse_date(date_str: str) -> Optional[date]:
     """Parse YYYY-MM-DD into a date object. Return None if invalid."""
+    # A precompiled match plus date() is much cheaper than strptime's format parsing.
+    m = DATE_RE.match(date_str.strip())
+    if m is None:
+        return None
     try:
-        return datetime.strptime(date_str.strip(), DATE_FMT).date()
-    except ValueError:
+        return date(int(m[1]), int(m[2]), int(m[3]))
+    except ValueError:  # e.g. 2026-02-30
         return None
 
 
@@ -69,6 +335,9 @@ def prompt_float(prompt: str) -> float:
         raw = input(prompt).strip()
         try:
             value = float(raw)
+            if not math.isfinite(value):
+                print("Please enter a valid number (example: 12.50).")
+                continue
             if value <= 0:
                 print("Amount must be greater than 0.")
                 continue
@@ -91,78 +360,68 @@ def prompt_date(prompt: str, allow_blank: bool = False) -> Optional[date]:
         print("Invalid date. Use YYYY-MM-DD (example: 2026-01-08).")
 
 
-def next_id(expenses: List[Dict[str, Any]]) -> int:
-    """Return the next integer ID based on current expenses."""
-    if not expenses:
-        return 1
-    existing_ids = [e.get("id", 0) for e in expenses if isinstance(e.get("id"), int)]
-    return (max(existing_ids) if existing_ids else 0) + 1
-
-
-def add_expense(expenses: List[Dict[str, Any]]) -> None:
+def add_expense(store: ExpenseStore) -> None:
     """Collect input, validate it, append a new expense, and save."""
     amount = prompt_float("Amount (e.g., 12.50): ")
-    category = prompt_nonempty("Category (e.g., food, gas, rent): ").lower()
+    category = sys.intern(prompt_nonempty("Category (e.g., food, gas, rent): ").lower())
     note = input("Note (optional): ").strip()
     when = prompt_date("Date (YYYY-MM-DD) [blank = today]: ", allow_blank=True)
     if when is None:
         when = date.today()
 
+    store.max_id += 1
     new_item = {
-        "id": next_id(expenses),
+        "id": store.max_id,
         "amount": round(amount, 2),
         "category": category,
         "note": note,
-        "date": when.strftime(DATE_FMT),
+        # Both forms, made once here: the string is stored and displayed as-is,
+        # the date object drives filtering and sorting.
+        "date": when.isoformat(),
+        "_date": when,
     }
 
-    expenses.append(new_item)
-    save_expenses(DATA_FILE, expenses)
+    _index_expense(store, new_item)
+    _insort_by_date(store, new_item)
+    append_expense(DATA_FILE, new_item)
     print(f"Added expense #{new_item['id']} ✅")
 
 
-def matches_filters(
-    item: Dict[str, Any],
-    category: Optional[str],
-    start: Optional[date],
-    end: Optional[date],
-) -> bool:
-    """Return True if an expense matches the chosen filters."""
-    
-    if category is not None and item.get("category") != category:
-        return False
-
-
-    item_date = parse_date(str(item.get("date", "")))
-    if item_date is None:
-        return False
-
-    if start is not None and item_date < start:
-        return False
-    if end is not None and item_date > end:
-        return False
-
-    return True
-
-
-def list_expenses(expenses: List[Dict[str, Any]]) -> None:
+def list_expenses(store: ExpenseStore) -> None:
     """Print expenses, optionally filtered and sorted by date descending."""
-    if not expenses:
+    if not store.expenses:
         print("No expenses yet.")
         return
 
-    category = input("Filter by category (blank = no filter): ").strip().lower() or None
+    raw_category = input("Filter by category (blank = no filter): ").strip().lower()
+    category = sys.intern(raw_category) if raw_category else None
     start = prompt_date("Start date YYYY-MM-DD (blank = none): ", allow_blank=True)
     end = prompt_date("End date YYYY-MM-DD (blank = none): ", allow_blank=True)
 
-    filtered = [e for e in expenses if matches_filters(e, category, start, end)]
-
-
-    def sort_key(e: Dict[str, Any]):
-        d = parse_date(str(e.get("date", ""))) or date.min
-        return (d, e.get("id", 0))
+    # The date slice already satisfies start/end; walk whichever of it and the
+    # category bucket is smaller and check the remaining predicate.
+    in_range = _date_range(store, start, end)
+    if category is None:
+        filtered = in_range
+    else:
+        bucket = store.by_category.get(category, [])
+        if len(bucket) < len(in_range):
+            # Inlined date predicate: no per-item call or global lookups.
+            filtered = [
+                e
+                for e in bucket
+                if (d := e["_date"]) is not None
+                and (start is None or d >= start)
+                and (end is None or d <= end)
+            ]
+        else:
+            filtered = [e for e in in_range if e.get("category") == category]
 
-    filtered.sort(key=sort_key, reverse=True)
+    # Decorate-sort-undecorate: tuples compare in C, with no key callback per item.
+    # (Filtered items always have a date; -i keeps (date, id) ties in input order.)
+    decorated = [(e["_date"], e.get("id", 0), -i, e) for i, e in enumerate(filtered)]
+    decorated.sort(reverse=True)
+    filtered = [e for _, _, _, e in decorated]
 
     if not filtered:
         print("No expenses matched your filters.")
@@ -170,36 +429,35 @@ def list_expenses(expenses: List[Dict[str, Any]]) -> None:
 
     print("\nID  Date        Amount   Category     Note")
     print("--  ----------  -------  ----------   -------------------------")
-    for e in filtered:
-        eid = str(e.get("id", "")).rjust(2)
-        d = str(e.get("date", "")).ljust(10)
-        amt = f"{float(e.get('amount', 0)):7.2f}"
-        cat = str(e.get("category", "")).ljust(10)
-        note = str(e.get("note", ""))[:25]
-        print(f"{eid}  {d}  {amt}  {cat}   {note}")
+    # Format every row first, then emit the table with a single write.
+    rows = [
+        f"{str(e.get('id', '')).rjust(2)}  {str(e.get('date', '')).ljust(10)}  "
+        f"{float(e.get('amount', 0)):7.2f}  {str(e.get('category', '')).ljust(10)}   "
+        f"{str(e.get('note', ''))[:25]}"
+        for e in filtered
+    ]
+    sys.stdout.write("\n".join(rows) + "\n")
 
     print(f"\nShown: {len(filtered)} expense(s)\n")
 
 
-def summarize(expenses: List[Dict[str, Any]]) -> None:
+def summarize(store: ExpenseStore) -> None:
     """Print total spending and totals per category (with optional date filtering)."""
-    if not expenses:
+    if not store.expenses:
         print("No expenses to summarize.")
         return
 
     start = prompt_date("Start date YYYY-MM-DD (blank = none): ", allow_blank=True)
     end = prompt_date("End date YYYY-MM-DD (blank = none): ", allow_blank=True)
 
-    filtered = [e for e in expenses if matches_filters(e, None, start, end)]
+    filtered = _date_range(store, start, end)
 
-    total = 0.0
-    by_category: Dict[str, float] = {}
+    amounts = [float(e.get("amount", 0)) for e in filtered]
+    total = math.fsum(amounts)  # exact sum, no drift across many small amounts
+    by_category: DefaultDict[str, float] = defaultdict(float)
 
-    for e in filtered:
-        amount = float(e.get("amount", 0))
-        total += amount
-        cat = str(e.get("category", "uncategorized"))
-        by_category[cat] = by_category.get(cat, 0.0) + amount
+    for e, amount in zip(filtered, amounts):
+        by_category[str(e.get("category", "uncategorized"))] += amount
 
     print("\nSummary")
     print("-------")
@@ -217,8 +475,9 @@ def summarize(expenses: List[Dict[str, Any]]) -> None:
     print("")
 
 
-def delete_expense(expenses: List[Dict[str, Any]]) -> None:
+def delete_expense(store: ExpenseStore) -> None:
     """Delete an expense by its ID."""
+    expenses = store.expenses
     if not expenses:
         print("No expenses to delete.")
         return
@@ -229,14 +488,44 @@ def delete_expense(expenses: List[Dict[str, Any]]) -> None:
         return
 
     target_id = int(raw)
-    for i, e in enumerate(expenses):
-        if e.get("id") == target_id:
-            removed = expenses.pop(i)
-            save_expenses(DATA_FILE, expenses)
-            print(f"Deleted expense #{removed.get('id')} ✅")
-            return
+    i = store.id_to_index.pop(target_id, None)
+    if i is None and target_id in store.duplicate_ids:
+        # Later copies of a repeated ID aren't indexed; find them the slow way.
+        i = next((j for j, e in enumerate(expenses) if e.get("id") == target_id), None)
+        if i is None:
+            store.duplicate_ids.discard(target_id)
+    if i is None:
+        print(f"No expense found with ID {target_id}.")
+        return
 
-    print(f"No expense found with ID {target_id}.")
+    # Swap the last expense into the hole, making the removal O(1). Order doesn't
+    # matter: list_expenses always re-sorts.
+    removed = expenses[i]
+    last = expenses.pop()
+    if last is not removed:
+        expenses[i] = last
+        if store.id_to_index.get(last.get("id")) == len(expenses):
+            store.id_to_index[last["id"]] = i
+
+    _discard(store.by_category.get(removed.get("category"), []), removed)
+    _remove_by_date(store, removed)
+    rewrite_expenses(DATA_FILE, expenses)
+    print(f"Deleted expense #{removed.get('id')} ✅")
+
+
+def dump_pretty(expenses: List[Dict[str, Any]]) -> None:
+    """Print all expenses as indented JSON (the data file itself stays compact)."""
+    records = [_stored_fields(e) for e in expenses]
+    # orjson already produces UTF-8; write it as-is rather than decoding it
+    # for print() to encode again. Replaced streams may have no byte buffer.
+    buffer = getattr(sys.stdout, "buffer", None)
+    if orjson is not None and buffer is not None and all(map(_all_finite, records)):
+        option = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        sys.stdout.flush()
+        buffer.write(orjson.dumps(records, option=option))
+        buffer.flush()
+    else:
+        print(json.dumps(records, indent=2, ensure_ascii=False))
 
 
 def print_menu() -> None:
@@ -250,22 +539,35 @@ def print_menu() -> None:
     print("5) Exit")
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Program entry point."""
-    expenses = load_expenses(DATA_FILE)
+    parser = argparse.ArgumentParser(description="Personal Expense Tracker")
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="print the saved expenses as indented JSON and exit",
+    )
+    args = parser.parse_args(argv)
+
+    if args.pretty:
+        # Read-only inspection: don't migrate or rewrite the data file.
+        dump_pretty(load_expenses(DATA_FILE, repair=False).expenses)
+        return
+
+    store = load_expenses(DATA_FILE)
 
     while True:
         print_menu()
         choice = input("Choose an option (1-5): ").strip()
 
         if choice == "1":
-            add_expense(expenses)
+            add_expense(store)
         elif choice == "2":
-            list_expenses(expenses)
+            list_expenses(store)
         elif choice == "3":
-            summarize(expenses)
+            summarize(store)
         elif choice == "4":
-            delete_expense(expenses)
+            delete_expense(store)
         elif choice == "5":
             print("Goodbye!")
             break
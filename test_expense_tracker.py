@@ -0,0 +1,158 @@
+import json
+import math
+
+import pytest
+
+import expense_tracker as et
+
+
+def record(eid, note=""):
+    return {
+        "id": eid,
+        "amount": 1.5,
+        "category": "food",
+        "note": note,
+        "date": "2026-01-02",
+    }
+
+
+def jsonl(*records):
+    return b"".join(json.dumps(r, ensure_ascii=False).encode() + b"\n" for r in records)
+
+
+def stored_ids(path):
+    return [json.loads(line)["id"] for line in path.read_bytes().splitlines()]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    """Run a test against orjson (when installed) and the stdlib json fallback."""
+    if request.param == "orjson":
+        if et.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(et, "orjson", None)
+    return request.param
+
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    path = tmp_path / "expenses.json"
+    monkeypatch.setattr(et, "DATA_FILE", str(path))
+    return path
+
+
+def ids(store):
+    return [e["id"] for e in store.expenses]
+
+
+def test_legacy_array_is_migrated_to_json_lines(data_file, backend):
+    data_file.write_text(json.dumps([record(1), record(2)], indent=2), encoding="utf-8")
+
+    assert ids(et.load_expenses(str(data_file))) == [1, 2]
+    assert stored_ids(data_file) == [1, 2]
+    assert ids(et.load_expenses(str(data_file))) == [1, 2]
+
+
+def test_torn_last_line_is_dropped_and_kept_aside(data_file, backend, capsys):
+    # An append interrupted in the middle of the multi-byte "é".
+    tail = jsonl(record(2, note="café"))
+    torn = tail[: tail.index("é".encode("utf-8")) + 1]
+    data_file.write_bytes(jsonl(record(1)) + torn)
+
+    assert ids(et.load_expenses(str(data_file))) == [1]
+    assert stored_ids(data_file) == [1]
+    assert data_file.read_bytes().endswith(b"\n")
+    assert (data_file.parent / "expenses.json.corrupt").read_bytes() == torn
+    captured = capsys.readouterr()
+    assert "incomplete last record" in captured.err
+    assert captured.out == ""
+
+
+def test_unterminated_valid_last_line_is_terminated(data_file, backend):
+    data_file.write_bytes(jsonl(record(1), record(2))[:-1])
+
+    assert ids(et.load_expenses(str(data_file))) == [1, 2]
+    assert data_file.read_bytes().endswith(b"\n")
+    assert not (data_file.parent / "expenses.json.corrupt").exists()
+
+
+@pytest.mark.parametrize("content", [b"null\n", b"42\n", b'{"id": 1}\n"x"\n', b"[1]"])
+def test_non_object_data_is_treated_as_unreadable(data_file, backend, content):
+    data_file.write_bytes(content)
+
+    assert ids(et.load_expenses(str(data_file))) == []
+    assert (data_file.parent / "expenses.json.corrupt").read_bytes() == content
+
+
+def test_unreadable_files_never_overwrite_earlier_backups(data_file, capsys):
+    for content in (b"bad one\n", b"bad two\n", b"bad three\n"):
+        data_file.write_bytes(content)
+        assert ids(et.load_expenses(str(data_file))) == []
+
+    assert not data_file.exists()
+    backups = sorted(p.name for p in data_file.parent.iterdir())
+    assert backups == [
+        "expenses.json.corrupt",
+        "expenses.json.corrupt.1",
+        "expenses.json.corrupt.2",
+    ]
+    assert (data_file.parent / "expenses.json.corrupt").read_bytes() == b"bad one\n"
+    assert "unreadable" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        json.dumps([record(1)]).encode("utf-8"),
+        jsonl(record(1)) + b'{"id": 2, "no',
+        b"not json\n",
+    ],
+)
+def test_repair_false_never_touches_the_file(data_file, content):
+    data_file.write_bytes(content)
+
+    et.load_expenses(str(data_file), repair=False)
+
+    assert data_file.read_bytes() == content
+    assert [p.name for p in data_file.parent.iterdir()] == ["expenses.json"]
+
+
+def test_pretty_is_read_only_and_keeps_warnings_off_stdout(data_file, capsys):
+    content = jsonl(record(1)) + b'{"id": 2, "no'
+    data_file.write_bytes(content)
+
+    et.main(["--pretty"])
+
+    captured = capsys.readouterr()
+    assert [r["id"] for r in json.loads(captured.out)] == [1]
+    assert "incomplete" in captured.err
+    assert data_file.read_bytes() == content
+
+
+def test_every_copy_of_a_duplicated_id_can_be_deleted(data_file, monkeypatch, capsys):
+    data_file.write_bytes(jsonl(record(5, "a"), record(2), record(5, "b"), record(5)))
+    store = et.load_expenses(str(data_file))
+    monkeypatch.setattr("builtins.input", lambda prompt="": "5")
+
+    for _ in range(3):
+        et.delete_expense(store)
+    assert ids(store) == [2]
+    et.delete_expense(store)
+
+    assert capsys.readouterr().out.count("Deleted expense #5") == 3
+    assert ids(et.load_expenses(str(data_file))) == [2]
+
+
+def test_non_finite_amounts_survive_both_backends(data_file, backend):
+    data_file.write_text('[{"id": 1, "amount": Infinity}]', encoding="utf-8")
+
+    assert math.isinf(et.load_expenses(str(data_file)).expenses[0]["amount"])
+    assert math.isinf(et.load_expenses(str(data_file)).expenses[0]["amount"])
+
+
+def test_prompt_float_rejects_non_finite_amounts(monkeypatch):
+    answers = iter(["inf", "nan", "12.5"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+
+    assert et.prompt_float("Amount: ") == 12.5